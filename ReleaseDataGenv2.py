@@ -1,15 +1,52 @@
 import os
+import re
+import sys
 import io
+import csv
 import time
 import random
+import itertools
+import contextlib
+import queue
+import threading
 import datetime
 import zipfile
 import gzip
-import requests
-import xml.etree.ElementTree as ET
+import struct
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape as xml_escape
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+try:
+    import lxml.etree as ET  # C (libxml2) element building + serialization
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv  # multithreaded CSV reader with per-column types
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+KEY_DTYPE = "string[pyarrow]" if HAS_PYARROW else "string"  # group-key dtype for the import tables
+
+try:
+    import deflate as _libdeflate  # libdeflate: faster one-shot DEFLATE + CRC32 for ZIP entries
+    HAS_LIBDEFLATE = True
+except ImportError:
+    HAS_LIBDEFLATE = False
+
 # ===== must be first Streamlit call =====
 st.set_page_config(page_title="OTM Order Generator (SO/PO + CSV/XLSX)", page_icon="📦", layout="wide")
 
@@ -28,10 +65,11 @@ if APP_PASS:
 # 🧰 Helpers
 # =========================
 def make_glog_date(dt: datetime.datetime) -> str:
-    return dt.strftime("%Y%m%d%H%M%S")
+    # YYYYMMDDHHMMSS; int formatting skips strftime's format-string parsing
+    return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}{dt.hour:02d}{dt.minute:02d}{dt.second:02d}"
 
-def _parse_list(s: str):
-    return [p.strip() for p in s.replace(",", "\n").split("\n") if p.strip()]
+def _parse_list(s: str) -> tuple:
+    return tuple(p.strip() for p in s.replace(",", "\n").split("\n") if p.strip())
 
 def is_nonprod_url(url: str) -> bool:
     """Allow only URLs that clearly target non-prod (must contain 'dev' or 'test')."""
@@ -40,6 +78,351 @@ def is_nonprod_url(url: str) -> bool:
     u = url.lower()
     return ("dev" in u) or ("test" in u)
 
+ORDER_QUEUE_MAX = 16  # built-but-unconsumed orders held in memory by _prefetch
+
+def _prefetch(iterable, maxsize: int = ORDER_QUEUE_MAX):
+    """
+    Yield the items of `iterable`, produced on a worker thread through a bounded queue:
+    the producer runs at most `maxsize` items ahead (backpressure), producer exceptions
+    are re-raised here, and closing this generator early stops the producer.
+    """
+    q = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    end = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            put((end, e))
+        else:
+            put((end, None))
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item, err = q.get()
+            if item is end:
+                if err is not None:
+                    raise err
+                return
+            yield item
+    finally:
+        stop.set()
+
+_ZIP_LOCAL_HDR = struct.Struct("<IHHHHHIIIHH")
+_ZIP_CENTRAL_HDR = struct.Struct("<IHHHHHHIIIHHHHHII")
+_ZIP_END_HDR = struct.Struct("<IHHHHIIH")
+ZIP_MAX_ENTRIES = 0xFFFF           # beyond these a bundle needs ZIP64 (zipfile fallback)
+ZIP_MAX_SIZE = 0xFFFFFFFF
+ZIP_STORE_MAX_BYTES = 512 * 1024   # below this (or this few entries) deflating costs more than it saves
+ZIP_STORE_MAX_ENTRIES = 8
+ZIP_LEVEL = 1                      # default DEFLATE level: ~2-3x faster than 6, output only slightly larger on XML
+
+def _dos_datetime(dt: datetime.datetime) -> tuple:
+    return (dt.hour << 11) | (dt.minute << 5) | (dt.second // 2), ((dt.year - 1980) << 9) | (dt.month << 5) | dt.day
+
+def _zip_should_deflate(sizes, force: bool = False) -> bool:
+    """Small bundles are stored: the deflate pass dominates latency and saves little."""
+    if force:
+        return True
+    return len(sizes) > ZIP_STORE_MAX_ENTRIES and sum(sizes) >= ZIP_STORE_MAX_BYTES
+
+class ZipStreamWriter:
+    """
+    Incremental ZIP writer: add(name, data) writes the entry to buf immediately, close()
+    writes the central directory. Entries are deflated in one libdeflate call each, with
+    CRCs from libdeflate. compress=None stores entries until the bundle has grown past
+    the small-bundle limits, then deflates the rest.
+    Falls back to zipfile when libdeflate is missing or zip64 is requested.
+    """
+
+    def __init__(self, buf, level: int = ZIP_LEVEL, compress=None, zip64: bool = False):
+        self.buf = buf
+        self.level = level
+        self.compress = compress
+        self.count = 0
+        self.raw_total = 0
+        self._zf = None
+        if not HAS_LIBDEFLATE or zip64:
+            self._zf = zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=level)
+        self._dos_time, self._dos_date = _dos_datetime(datetime.datetime.now())
+        self._central = bytearray()
+        self._offset = 0
+
+    def _method(self) -> int:
+        deflate_it = self.compress
+        if deflate_it is None:
+            deflate_it = self.count > ZIP_STORE_MAX_ENTRIES and self.raw_total >= ZIP_STORE_MAX_BYTES
+        return zipfile.ZIP_DEFLATED if deflate_it else zipfile.ZIP_STORED
+
+    def add(self, name: str, data: bytes) -> None:
+        method = self._method()
+        self.count += 1
+        self.raw_total += len(data)
+        if self._zf is not None:
+            self._zf.writestr(name, data, compress_type=method)
+            return
+
+        fname = name.encode("utf-8")
+        flags = 0x800 if not fname.isascii() else 0
+        body = data if method == zipfile.ZIP_STORED else _libdeflate.deflate_compress(data, self.level)
+        crc = _libdeflate.crc32(data)
+        self.buf.write(_ZIP_LOCAL_HDR.pack(
+            0x04034B50, 20, flags, method, self._dos_time, self._dos_date,
+            crc, len(body), len(data), len(fname), 0,
+        ))
+        self.buf.write(fname)
+        self.buf.write(body)
+        self._central += _ZIP_CENTRAL_HDR.pack(
+            0x02014B50, 20, 20, flags, method, self._dos_time, self._dos_date,
+            crc, len(body), len(data), len(fname), 0, 0, 0, 0, 0, self._offset,
+        )
+        self._central += fname
+        self._offset += _ZIP_LOCAL_HDR.size + len(fname) + len(body)
+
+    def close(self) -> None:
+        if self._zf is not None:
+            self._zf.close()
+            return
+        self.buf.write(self._central)
+        self.buf.write(_ZIP_END_HDR.pack(
+            0x06054B50, 0, 0, self.count, self.count, len(self._central), self._offset, 0,
+        ))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _new_transmission_root():
+    """<otm:Transmission> root; lxml declares the otm/gtm prefixes via nsmap."""
+    if HAS_LXML:
+        return ET.Element(TAG_TRANSMISSION, nsmap={"otm": OTM_NS, "gtm": GTM_NS})
+    return ET.Element(TAG_TRANSMISSION, {"xmlns:otm": OTM_NS, "xmlns:gtm": GTM_NS})
+
+# =========================
+# 🏷️ OTM namespaces + Clark-notation tags (built once at import)
+# =========================
+OTM_NS = "http://xmlns.oracle.com/apps/otm/transmission/v6.4"
+GTM_NS = "http://xmlns.oracle.com/apps/gtm/transmission/v6.4"
+
+TAG_TRANSMISSION                    = f"{{{OTM_NS}}}Transmission"
+TAG_TRANSMISSION_HEADER             = f"{{{OTM_NS}}}TransmissionHeader"
+TAG_TRANSMISSION_CREATE_DT          = f"{{{OTM_NS}}}TransmissionCreateDt"
+TAG_GLOG_DATE                       = f"{{{OTM_NS}}}GLogDate"
+TAG_TRANSMISSION_BODY               = f"{{{OTM_NS}}}TransmissionBody"
+TAG_GLOG_XML_ELEMENT                = f"{{{OTM_NS}}}GLogXMLElement"
+TAG_RELEASE                         = f"{{{OTM_NS}}}Release"
+TAG_RELEASE_GID                     = f"{{{OTM_NS}}}ReleaseGid"
+TAG_GID                             = f"{{{OTM_NS}}}Gid"
+TAG_DOMAIN_NAME                     = f"{{{OTM_NS}}}DomainName"
+TAG_XID                             = f"{{{OTM_NS}}}Xid"
+TAG_TRANSACTION_CODE                = f"{{{OTM_NS}}}TransactionCode"
+TAG_SHIP_FROM_LOCATION_REF          = f"{{{OTM_NS}}}ShipFromLocationRef"
+TAG_LOCATION_REF                    = f"{{{OTM_NS}}}LocationRef"
+TAG_LOCATION_GID                    = f"{{{OTM_NS}}}LocationGid"
+TAG_SHIP_TO_LOCATION_REF            = f"{{{OTM_NS}}}ShipToLocationRef"
+TAG_TIME_WINDOW                     = f"{{{OTM_NS}}}TimeWindow"
+TAG_EARLY_PICKUP_DT                 = f"{{{OTM_NS}}}EarlyPickupDt"
+TAG_LATE_PICKUP_DT                  = f"{{{OTM_NS}}}LatePickupDt"
+TAG_RELEASE_LINE                    = f"{{{OTM_NS}}}ReleaseLine"
+TAG_RELEASE_LINE_GID                = f"{{{OTM_NS}}}ReleaseLineGid"
+TAG_PACKAGED_ITEM_REF               = f"{{{OTM_NS}}}PackagedItemRef"
+TAG_PACKAGED_ITEM_GID               = f"{{{OTM_NS}}}PackagedItemGid"
+TAG_ITEM_QUANTITY                   = f"{{{OTM_NS}}}ItemQuantity"
+TAG_PACKAGED_ITEM_COUNT             = f"{{{OTM_NS}}}PackagedItemCount"
+TAG_DECLARED_VALUE                  = f"{{{OTM_NS}}}DeclaredValue"
+TAG_FINANCIAL_AMOUNT                = f"{{{OTM_NS}}}FinancialAmount"
+TAG_GLOBAL_CURRENCY_CODE            = f"{{{OTM_NS}}}GlobalCurrencyCode"
+TAG_MONETARY_AMOUNT                 = f"{{{OTM_NS}}}MonetaryAmount"
+TAG_RELEASE_TYPE_GID                = f"{{{OTM_NS}}}ReleaseTypeGid"
+TAG_RELEASE_REFNUM                  = f"{{{OTM_NS}}}ReleaseRefnum"
+TAG_RELEASE_REFNUM_QUALIFIER_GID    = f"{{{OTM_NS}}}ReleaseRefnumQualifierGid"
+TAG_RELEASE_REFNUM_VALUE            = f"{{{OTM_NS}}}ReleaseRefnumValue"
+TAG_TRANS_ORDER                     = f"{{{OTM_NS}}}TransOrder"
+TAG_TRANS_ORDER_HEADER              = f"{{{OTM_NS}}}TransOrderHeader"
+TAG_TRANS_ORDER_GID                 = f"{{{OTM_NS}}}TransOrderGid"
+TAG_RELEASE_METHOD_GID              = f"{{{OTM_NS}}}ReleaseMethodGid"
+TAG_INVOLVED_PARTY                  = f"{{{OTM_NS}}}InvolvedParty"
+TAG_INVOLVED_PARTY_QUALIFIER_GID    = f"{{{OTM_NS}}}InvolvedPartyQualifierGid"
+TAG_INVOLVED_PARTY_LOCATION_REF     = f"{{{OTM_NS}}}InvolvedPartyLocationRef"
+TAG_CONTACT_REF                     = f"{{{OTM_NS}}}ContactRef"
+TAG_CONTACT                         = f"{{{OTM_NS}}}Contact"
+TAG_CONTACT_GID                     = f"{{{OTM_NS}}}ContactGid"
+TAG_ORDER_TYPE_GID                  = f"{{{OTM_NS}}}OrderTypeGid"
+TAG_ORDER_REFNUM                    = f"{{{OTM_NS}}}OrderRefnum"
+TAG_ORDER_REFNUM_QUALIFIER_GID      = f"{{{OTM_NS}}}OrderRefnumQualifierGid"
+TAG_ORDER_REFNUM_VALUE              = f"{{{OTM_NS}}}OrderRefnumValue"
+TAG_FLEX_FIELD_STRINGS              = f"{{{OTM_NS}}}FlexFieldStrings"
+TAG_ATTRIBUTE_2                     = f"{{{OTM_NS}}}Attribute2"
+TAG_ATTRIBUTE_3                     = f"{{{OTM_NS}}}Attribute3"
+TAG_ATTRIBUTE_4                     = f"{{{OTM_NS}}}Attribute4"
+TAG_FLEX_FIELD_NUMBERS              = f"{{{OTM_NS}}}FlexFieldNumbers"
+TAG_ATTRIBUTE_NUMBER_1              = f"{{{OTM_NS}}}AttributeNumber1"
+TAG_FLEX_FIELD_DATES                = f"{{{OTM_NS}}}FlexFieldDates"
+TAG_ATTRIBUTE_DATE_1                = f"{{{OTM_NS}}}AttributeDate1"
+TAG_FLEX_FIELD_CURRENCIES           = f"{{{OTM_NS}}}FlexFieldCurrencies"
+TAG_TRANS_ORDER_LINE_DETAIL         = f"{{{OTM_NS}}}TransOrderLineDetail"
+TAG_TRANS_ORDER_LINE                = f"{{{OTM_NS}}}TransOrderLine"
+TAG_TRANS_ORDER_LINE_GID            = f"{{{OTM_NS}}}TransOrderLineGid"
+TAG_RATE_TO_BASE                    = f"{{{OTM_NS}}}RateToBase"
+TAG_FUNC_CURRENCY_AMOUNT            = f"{{{OTM_NS}}}FuncCurrencyAmount"
+TAG_TZ_ID                           = f"{{{OTM_NS}}}TZId"
+TAG_TZ_OFFSET                       = f"{{{OTM_NS}}}TZOffset"
+TAG_PLAN_FROM_LOCATION_GID          = f"{{{OTM_NS}}}PlanFromLocationGid"
+TAG_ORDER_LINE_REFNUM               = f"{{{OTM_NS}}}OrderLineRefnum"
+TAG_ORDER_LINE_REFNUM_QUALIFIER_GID = f"{{{OTM_NS}}}OrderLineRefnumQualifierGid"
+TAG_ORDER_LINE_REFNUM_VALUE         = f"{{{OTM_NS}}}OrderLineRefnumValue"
+TAG_ATTRIBUTE_1                     = f"{{{OTM_NS}}}Attribute1"
+TAG_ATTRIBUTE_NUMBER_2              = f"{{{OTM_NS}}}AttributeNumber2"
+
+# Fixed code values shared by both builders (one interned object each)
+_IU             = sys.intern("IU")
+_SALES_ORDER    = sys.intern("SALES_ORDER")
+_ORDER_TYPE     = sys.intern("ORDER_TYPE")
+_DIRECTION      = sys.intern("DIRECTION")
+_OUTBOUND       = sys.intern("OUTBOUND")
+_PURCHASE_ORDER = sys.intern("PURCHASE_ORDER")
+
+# =========================
+# ⚡ XML bytes templates (fast builder: no DOM, one pass to UTF-8)
+# =========================
+# Same bytes lxml emits for the DOM path, so the two builders can be diffed.
+# Templates are encoded once at import; per order only the variable fields are
+# escaped + encoded and spliced in with bytes %-formatting (%(name)b).
+XML_DECL = "<?xml version='1.0' encoding='utf-8'?>\n"
+TRANSMISSION_OPEN = f'<otm:Transmission xmlns:otm="{OTM_NS}" xmlns:gtm="{GTM_NS}">'
+
+def _esc_b(s: str) -> bytes:
+    """Escape element text the way lxml does (incl. CR, which parsers would otherwise normalize), as UTF-8."""
+    return xml_escape(s, {"\r": "&#13;"}).encode("utf-8")
+
+def _num_b(x) -> bytes:
+    """str() of a number as bytes (what str.format emitted for {value})."""
+    return str(x).encode("ascii")
+
+def _gid_tmpl(domain: str, xid: str) -> str:
+    return f"<otm:Gid><otm:DomainName>{domain}</otm:DomainName><otm:Xid>{xid}</otm:Xid></otm:Gid>"
+
+def _location_ref_tmpl(tag: str, xid: str) -> str:
+    return (f"<otm:{tag}><otm:LocationRef><otm:LocationGid>"
+            + _gid_tmpl("%(domain)b", xid)
+            + f"</otm:LocationGid></otm:LocationRef></otm:{tag}>")
+
+RELEASE_HEADER_TMPL = (
+    XML_DECL + TRANSMISSION_OPEN
+    + "<otm:TransmissionHeader><otm:TransmissionCreateDt><otm:GLogDate>%(now)b</otm:GLogDate></otm:TransmissionCreateDt></otm:TransmissionHeader>"
+    + "<otm:TransmissionBody><otm:GLogXMLElement><otm:Release>"
+    + "<otm:ReleaseGid>" + _gid_tmpl("%(domain)b", "%(xid)b") + "</otm:ReleaseGid>"
+    + f"<otm:TransactionCode>{_IU}</otm:TransactionCode>"
+    + _location_ref_tmpl("ShipFromLocationRef", "%(ship_from_xid)b")
+    + _location_ref_tmpl("ShipToLocationRef", "%(ship_to_xid)b")
+    + "<otm:TimeWindow>"
+    + "<otm:EarlyPickupDt><otm:GLogDate>%(early)b</otm:GLogDate></otm:EarlyPickupDt>"
+    + "<otm:LatePickupDt><otm:GLogDate>%(late)b</otm:GLogDate></otm:LatePickupDt>"
+    + "</otm:TimeWindow>"
+).encode("utf-8")
+
+RELEASE_LINE_TMPL = (
+    "<otm:ReleaseLine>"
+    + "<otm:ReleaseLineGid>" + _gid_tmpl("%(domain)b", "%(line_xid)b") + "</otm:ReleaseLineGid>"
+    + f"<otm:TransactionCode>{_IU}</otm:TransactionCode>"
+    + "<otm:PackagedItemRef><otm:PackagedItemGid>" + _gid_tmpl("%(domain)b", "%(item_xid)b") + "</otm:PackagedItemGid></otm:PackagedItemRef>"
+    + "<otm:ItemQuantity><otm:PackagedItemCount>%(qty)d</otm:PackagedItemCount>"
+    + "<otm:DeclaredValue><otm:FinancialAmount>"
+    + "<otm:GlobalCurrencyCode>%(currency)b</otm:GlobalCurrencyCode><otm:MonetaryAmount>%(value)b</otm:MonetaryAmount>"
+    + "</otm:FinancialAmount></otm:DeclaredValue></otm:ItemQuantity>"
+    + "</otm:ReleaseLine>"
+).encode("utf-8")
+
+RELEASE_FOOTER_TMPL = (
+    f"<otm:ReleaseTypeGid><otm:Gid><otm:Xid>{_SALES_ORDER}</otm:Xid></otm:Gid></otm:ReleaseTypeGid>"
+    + "<otm:ReleaseRefnum><otm:ReleaseRefnumQualifierGid>" + _gid_tmpl("%(domain)b", _ORDER_TYPE) + "</otm:ReleaseRefnumQualifierGid>"
+    + f"<otm:ReleaseRefnumValue>{_SALES_ORDER}</otm:ReleaseRefnumValue></otm:ReleaseRefnum>"
+    + "<otm:ReleaseRefnum><otm:ReleaseRefnumQualifierGid>" + _gid_tmpl("%(domain)b", _DIRECTION) + "</otm:ReleaseRefnumQualifierGid>"
+    + f"<otm:ReleaseRefnumValue>{_OUTBOUND}</otm:ReleaseRefnumValue></otm:ReleaseRefnum>"
+    + "</otm:Release></otm:GLogXMLElement></otm:TransmissionBody></otm:Transmission>"
+).encode("utf-8")
+
+PO_HEADER_TMPL = (
+    XML_DECL + TRANSMISSION_OPEN
+    + "<otm:TransmissionHeader/>"
+    + "<otm:TransmissionBody><otm:GLogXMLElement><otm:TransOrder><otm:TransOrderHeader>"
+    + "<otm:TransOrderGid>" + _gid_tmpl("%(domain)b", "%(po_xid)b") + "</otm:TransOrderGid>"
+    + f"<otm:TransactionCode>{_IU}</otm:TransactionCode>"
+    + "<otm:ReleaseMethodGid>" + _gid_tmpl("%(domain)b", "%(release_method_xid)b") + "</otm:ReleaseMethodGid>"
+    + "<otm:InvolvedParty>"
+    + "<otm:InvolvedPartyQualifierGid><otm:Gid><otm:Xid>SHIP FROM</otm:Xid></otm:Gid></otm:InvolvedPartyQualifierGid>"
+    + "<otm:InvolvedPartyLocationRef><otm:LocationRef><otm:LocationGid>" + _gid_tmpl("%(domain)b", "%(ship_from_xid)b")
+    + "</otm:LocationGid></otm:LocationRef></otm:InvolvedPartyLocationRef>"
+    + "<otm:ContactRef><otm:Contact><otm:ContactGid>" + _gid_tmpl("%(domain)b", "%(ship_from_xid)b")
+    + "</otm:ContactGid></otm:Contact></otm:ContactRef>"
+    + "</otm:InvolvedParty>"
+    + f"<otm:OrderTypeGid><otm:Gid><otm:Xid>{_PURCHASE_ORDER}</otm:Xid></otm:Gid></otm:OrderTypeGid>"
+    + "%(order_refnums)b"
+    + "<otm:FlexFieldStrings><otm:Attribute2>%(ff_attr2)b</otm:Attribute2><otm:Attribute3>%(ff_attr3)b</otm:Attribute3>"
+    + "<otm:Attribute4>%(ff_attr4)b</otm:Attribute4></otm:FlexFieldStrings>"
+    + "<otm:FlexFieldNumbers><otm:AttributeNumber1>%(ff_number1)b</otm:AttributeNumber1></otm:FlexFieldNumbers>"
+    + "<otm:FlexFieldDates><otm:AttributeDate1><otm:GLogDate>%(ff_date1)b</otm:GLogDate></otm:AttributeDate1></otm:FlexFieldDates>"
+    + "<otm:FlexFieldCurrencies/>"
+    + "</otm:TransOrderHeader>"
+).encode("utf-8")
+
+PO_ORDER_REFNUM_TMPL = (
+    "<otm:OrderRefnum><otm:OrderRefnumQualifierGid>" + _gid_tmpl("%(domain)b", "%(qual_xid)b")
+    + "</otm:OrderRefnumQualifierGid><otm:OrderRefnumValue>%(value)b</otm:OrderRefnumValue></otm:OrderRefnum>"
+).encode("utf-8")
+
+PO_LINE_REFNUM_TMPL = (
+    "<otm:OrderLineRefnum><otm:OrderLineRefnumQualifierGid>" + _gid_tmpl("%(domain)b", "%(qual_xid)b")
+    + "</otm:OrderLineRefnumQualifierGid><otm:OrderLineRefnumValue>%(value)b</otm:OrderLineRefnumValue></otm:OrderLineRefnum>"
+).encode("utf-8")
+
+PO_LINE_TMPL = (
+    "<otm:TransOrderLine>"
+    + "<otm:TransOrderLineGid>" + _gid_tmpl("%(domain)b", "%(line_xid)b") + "</otm:TransOrderLineGid>"
+    + f"<otm:TransactionCode>{_IU}</otm:TransactionCode>"
+    + "<otm:PackagedItemRef><otm:PackagedItemGid>" + _gid_tmpl("%(domain)b", "%(item_xid)b") + "</otm:PackagedItemGid></otm:PackagedItemRef>"
+    + _location_ref_tmpl("ShipFromLocationRef", "%(ship_from_xid)b")
+    + _location_ref_tmpl("ShipToLocationRef", "%(ship_to_xid)b")
+    + "<otm:ItemQuantity><otm:PackagedItemCount>%(qty)d</otm:PackagedItemCount>"
+    + "<otm:DeclaredValue><otm:FinancialAmount>"
+    + "<otm:GlobalCurrencyCode>%(currency)b</otm:GlobalCurrencyCode><otm:MonetaryAmount>%(value)b</otm:MonetaryAmount>"
+    + "<otm:RateToBase>%(rate_to_base)b</otm:RateToBase><otm:FuncCurrencyAmount>%(func_currency_amount)b</otm:FuncCurrencyAmount>"
+    + "</otm:FinancialAmount></otm:DeclaredValue></otm:ItemQuantity>"
+    + "<otm:TimeWindow>"
+    + "<otm:EarlyPickupDt><otm:GLogDate>%(early)b</otm:GLogDate><otm:TZId>%(tz_id)b</otm:TZId><otm:TZOffset>%(tz_offset)b</otm:TZOffset></otm:EarlyPickupDt>"
+    + "<otm:LatePickupDt><otm:GLogDate>%(late)b</otm:GLogDate><otm:TZId>%(tz_id)b</otm:TZId><otm:TZOffset>%(tz_offset)b</otm:TZOffset></otm:LatePickupDt>"
+    + "</otm:TimeWindow>"
+    + "<otm:PlanFromLocationGid><otm:LocationGid>" + _gid_tmpl("%(domain)b", "%(plan_from_xid)b") + "</otm:LocationGid></otm:PlanFromLocationGid>"
+    + "%(line_refnums)b"
+    + "<otm:FlexFieldStrings><otm:Attribute1>COUNTRY_OF_ORIGIN</otm:Attribute1><otm:Attribute2>UOMCODE</otm:Attribute2></otm:FlexFieldStrings>"
+    + "<otm:FlexFieldNumbers><otm:AttributeNumber1>%(ff_number1)b</otm:AttributeNumber1><otm:AttributeNumber2>%(ff_number1)b</otm:AttributeNumber2></otm:FlexFieldNumbers>"
+    + "<otm:FlexFieldDates/>"
+    + "</otm:TransOrderLine>"
+).encode("utf-8")
+
+PO_FOOTER_TMPL = b"</otm:TransOrder></otm:GLogXMLElement></otm:TransmissionBody></otm:Transmission>"
+
+def _tostring_with_decl(root) -> bytes:
+    """DOM -> UTF-8 bytes with declaration; stdlib gets XML_DECL prepended instead of xml_declaration=True."""
+    if HAS_LXML:
+        return ET.tostring(root, encoding="utf-8", xml_declaration=True)  # single C pass
+    return XML_DECL.encode("utf-8") + ET.tostring(root, encoding="utf-8")
+
 # =========================
 # 🧰 Sales Order XML (Release)
 # =========================
@@ -54,6 +437,7 @@ def build_release_xml(
     use_release_suffix_in_gid: bool = False,      # False => ReleaseGid = base_release_xid
     use_release_suffix_in_line_ids: bool = False, # False => line prefix = base_release_xid
     currency: str = "USD",                        # default if line-level currency not provided
+    use_fast_builder: bool = True,                # False => ElementTree/lxml DOM path (A/B validation)
 ) -> bytes:
     """
     Builds a <otm:Release> payload.
@@ -65,102 +449,116 @@ def build_release_xml(
     early = now + datetime.timedelta(days=7)
     late  = early + datetime.timedelta(days=1)
 
-    otm_ns = "http://xmlns.oracle.com/apps/otm/transmission/v6.4"
-    gtm_ns = "http://xmlns.oracle.com/apps/gtm/transmission/v6.4"
-    E = lambda tag: f"{{{otm_ns}}}{tag}"
-
     release_suffix = f"R{release_index}"
     release_gid_xid = f"{base_release_xid}_{release_suffix}" if use_release_suffix_in_gid else base_release_xid
     line_prefix = f"{base_release_xid}_{release_suffix}" if use_release_suffix_in_line_ids else base_release_xid
 
-    root = ET.Element(f"{{{otm_ns}}}Transmission", {"xmlns:otm": otm_ns, "xmlns:gtm": gtm_ns})
-    th = ET.SubElement(root, E("TransmissionHeader"))
-    tcd = ET.SubElement(th, E("TransmissionCreateDt"))
-    ET.SubElement(tcd, E("GLogDate")).text = make_glog_date(now)
-
-    body = ET.SubElement(root, E("TransmissionBody"))
-    glx = ET.SubElement(body, E("GLogXMLElement"))
-    rel = ET.SubElement(glx, E("Release"))
+    if use_fast_builder:
+        esc = _esc_b
+        d = esc(domain)
+        buf = bytearray(RELEASE_HEADER_TMPL % {
+            b"now": make_glog_date(now).encode("ascii"), b"domain": d, b"xid": esc(release_gid_xid),
+            b"ship_from_xid": esc(ship_from_xid), b"ship_to_xid": esc(ship_to_xid),
+            b"early": make_glog_date(early).encode("ascii"), b"late": make_glog_date(late).encode("ascii"),
+        })
+        for idx, line in enumerate(lines, start=1):
+            line_xid = str(line.get("line_xid", "")).strip() or f"{line_prefix}_{idx:03d}"
+            buf.extend(RELEASE_LINE_TMPL % {
+                b"domain": d, b"line_xid": esc(line_xid), b"item_xid": esc(line["item_xid"]),
+                b"qty": int(line["qty"]), b"currency": esc(str(line.get("currency", currency))),
+                b"value": _num_b(float(line["value"])),
+            })
+        buf.extend(RELEASE_FOOTER_TMPL % {b"domain": d})
+        return bytes(buf)
+
+    root = _new_transmission_root()
+    th = ET.SubElement(root, TAG_TRANSMISSION_HEADER)
+    tcd = ET.SubElement(th, TAG_TRANSMISSION_CREATE_DT)
+    ET.SubElement(tcd, TAG_GLOG_DATE).text = make_glog_date(now)
+
+    body = ET.SubElement(root, TAG_TRANSMISSION_BODY)
+    glx = ET.SubElement(body, TAG_GLOG_XML_ELEMENT)
+    rel = ET.SubElement(glx, TAG_RELEASE)
 
     # Release GID
-    rgid = ET.SubElement(rel, E("ReleaseGid"))
-    gid = ET.SubElement(rgid, E("Gid"))
-    ET.SubElement(gid, E("DomainName")).text = domain
-    ET.SubElement(gid, E("Xid")).text = release_gid_xid
+    rgid = ET.SubElement(rel, TAG_RELEASE_GID)
+    gid = ET.SubElement(rgid, TAG_GID)
+    ET.SubElement(gid, TAG_DOMAIN_NAME).text = domain
+    ET.SubElement(gid, TAG_XID).text = release_gid_xid
 
-    ET.SubElement(rel, E("TransactionCode")).text = "IU"
+    ET.SubElement(rel, TAG_TRANSACTION_CODE).text = _IU
 
     # ShipFrom
-    sfrom = ET.SubElement(rel, E("ShipFromLocationRef"))
-    lref = ET.SubElement(sfrom, E("LocationRef"))
-    lgid = ET.SubElement(lref, E("LocationGid"))
-    gid3 = ET.SubElement(lgid, E("Gid"))
-    ET.SubElement(gid3, E("DomainName")).text = domain
-    ET.SubElement(gid3, E("Xid")).text = ship_from_xid
+    sfrom = ET.SubElement(rel, TAG_SHIP_FROM_LOCATION_REF)
+    lref = ET.SubElement(sfrom, TAG_LOCATION_REF)
+    lgid = ET.SubElement(lref, TAG_LOCATION_GID)
+    gid3 = ET.SubElement(lgid, TAG_GID)
+    ET.SubElement(gid3, TAG_DOMAIN_NAME).text = domain
+    ET.SubElement(gid3, TAG_XID).text = ship_from_xid
 
     # ShipTo
-    sto = ET.SubElement(rel, E("ShipToLocationRef"))
-    lref2 = ET.SubElement(sto, E("LocationRef"))
-    lgid2 = ET.SubElement(lref2, E("LocationGid"))
-    gid4 = ET.SubElement(lgid2, E("Gid"))
-    ET.SubElement(gid4, E("DomainName")).text = domain
-    ET.SubElement(gid4, E("Xid")).text = ship_to_xid
+    sto = ET.SubElement(rel, TAG_SHIP_TO_LOCATION_REF)
+    lref2 = ET.SubElement(sto, TAG_LOCATION_REF)
+    lgid2 = ET.SubElement(lref2, TAG_LOCATION_GID)
+    gid4 = ET.SubElement(lgid2, TAG_GID)
+    ET.SubElement(gid4, TAG_DOMAIN_NAME).text = domain
+    ET.SubElement(gid4, TAG_XID).text = ship_to_xid
 
     # TimeWindow (simple default)
-    tw = ET.SubElement(rel, E("TimeWindow"))
-    ep = ET.SubElement(tw, E("EarlyPickupDt"))
-    ET.SubElement(ep, E("GLogDate")).text = make_glog_date(early)
-    lp = ET.SubElement(tw, E("LatePickupDt"))
-    ET.SubElement(lp, E("GLogDate")).text = make_glog_date(late)
+    tw = ET.SubElement(rel, TAG_TIME_WINDOW)
+    ep = ET.SubElement(tw, TAG_EARLY_PICKUP_DT)
+    ET.SubElement(ep, TAG_GLOG_DATE).text = make_glog_date(early)
+    lp = ET.SubElement(tw, TAG_LATE_PICKUP_DT)
+    ET.SubElement(lp, TAG_GLOG_DATE).text = make_glog_date(late)
 
     # Lines (sequential or user-specified)
     for idx, line in enumerate(lines, start=1):
         default_line_xid = f"{line_prefix}_{idx:03d}"
         line_xid = str(line.get("line_xid", "")).strip() or default_line_xid
 
-        rl = ET.SubElement(rel, E("ReleaseLine"))
-        rlg = ET.SubElement(rl, E("ReleaseLineGid"))
-        gidL = ET.SubElement(rlg, E("Gid"))
-        ET.SubElement(gidL, E("DomainName")).text = domain
-        ET.SubElement(gidL, E("Xid")).text = line_xid
+        rl = ET.SubElement(rel, TAG_RELEASE_LINE)
+        rlg = ET.SubElement(rl, TAG_RELEASE_LINE_GID)
+        gidL = ET.SubElement(rlg, TAG_GID)
+        ET.SubElement(gidL, TAG_DOMAIN_NAME).text = domain
+        ET.SubElement(gidL, TAG_XID).text = line_xid
 
-        ET.SubElement(rl, E("TransactionCode")).text = "IU"
+        ET.SubElement(rl, TAG_TRANSACTION_CODE).text = _IU
 
         # Item
-        piref = ET.SubElement(rl, E("PackagedItemRef"))
-        pig = ET.SubElement(piref, E("PackagedItemGid"))
-        gidP = ET.SubElement(pig, E("Gid"))
-        ET.SubElement(gidP, E("DomainName")).text = domain
-        ET.SubElement(gidP, E("Xid")).text = line["item_xid"]
+        piref = ET.SubElement(rl, TAG_PACKAGED_ITEM_REF)
+        pig = ET.SubElement(piref, TAG_PACKAGED_ITEM_GID)
+        gidP = ET.SubElement(pig, TAG_GID)
+        ET.SubElement(gidP, TAG_DOMAIN_NAME).text = domain
+        ET.SubElement(gidP, TAG_XID).text = line["item_xid"]
 
         # Quantity + Declared Value (per-line currency if provided)
-        iq = ET.SubElement(rl, E("ItemQuantity"))
-        ET.SubElement(iq, E("PackagedItemCount")).text = str(int(line["qty"]))
-        dv = ET.SubElement(iq, E("DeclaredValue"))
-        fa = ET.SubElement(dv, E("FinancialAmount"))
-        ET.SubElement(fa, E("GlobalCurrencyCode")).text = str(line.get("currency", currency))
-        ET.SubElement(fa, E("MonetaryAmount")).text = str(float(line["value"]))
+        iq = ET.SubElement(rl, TAG_ITEM_QUANTITY)
+        ET.SubElement(iq, TAG_PACKAGED_ITEM_COUNT).text = str(int(line["qty"]))
+        dv = ET.SubElement(iq, TAG_DECLARED_VALUE)
+        fa = ET.SubElement(dv, TAG_FINANCIAL_AMOUNT)
+        ET.SubElement(fa, TAG_GLOBAL_CURRENCY_CODE).text = str(line.get("currency", currency))
+        ET.SubElement(fa, TAG_MONETARY_AMOUNT).text = str(float(line["value"]))
 
     # ReleaseType + Refnums (Sales Order defaults)
-    rtg = ET.SubElement(rel, E("ReleaseTypeGid"))
-    gidT = ET.SubElement(rtg, E("Gid"))
-    ET.SubElement(gidT, E("Xid")).text = "SALES_ORDER"
-
-    rref1 = ET.SubElement(rel, E("ReleaseRefnum"))
-    rrq1 = ET.SubElement(rref1, E("ReleaseRefnumQualifierGid"))
-    gidQ1 = ET.SubElement(rrq1, E("Gid"))
-    ET.SubElement(gidQ1, E("DomainName")).text = domain
-    ET.SubElement(gidQ1, E("Xid")).text = "ORDER_TYPE"
-    ET.SubElement(rref1, E("ReleaseRefnumValue")).text = "SALES_ORDER"
-
-    rref2 = ET.SubElement(rel, E("ReleaseRefnum"))
-    rrq2 = ET.SubElement(rref2, E("ReleaseRefnumQualifierGid"))
-    gidQ2 = ET.SubElement(rrq2, E("Gid"))
-    ET.SubElement(gidQ2, E("DomainName")).text = domain
-    ET.SubElement(gidQ2, E("Xid")).text = "DIRECTION"
-    ET.SubElement(rref2, E("ReleaseRefnumValue")).text = "OUTBOUND"
-
-    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+    rtg = ET.SubElement(rel, TAG_RELEASE_TYPE_GID)
+    gidT = ET.SubElement(rtg, TAG_GID)
+    ET.SubElement(gidT, TAG_XID).text = _SALES_ORDER
+
+    rref1 = ET.SubElement(rel, TAG_RELEASE_REFNUM)
+    rrq1 = ET.SubElement(rref1, TAG_RELEASE_REFNUM_QUALIFIER_GID)
+    gidQ1 = ET.SubElement(rrq1, TAG_GID)
+    ET.SubElement(gidQ1, TAG_DOMAIN_NAME).text = domain
+    ET.SubElement(gidQ1, TAG_XID).text = _ORDER_TYPE
+    ET.SubElement(rref1, TAG_RELEASE_REFNUM_VALUE).text = _SALES_ORDER
+
+    rref2 = ET.SubElement(rel, TAG_RELEASE_REFNUM)
+    rrq2 = ET.SubElement(rref2, TAG_RELEASE_REFNUM_QUALIFIER_GID)
+    gidQ2 = ET.SubElement(rrq2, TAG_GID)
+    ET.SubElement(gidQ2, TAG_DOMAIN_NAME).text = domain
+    ET.SubElement(gidQ2, TAG_XID).text = _DIRECTION
+    ET.SubElement(rref2, TAG_RELEASE_REFNUM_VALUE).text = _OUTBOUND
+
+    return _tostring_with_decl(root)
 
 # =========================
 # 🧰 Purchase Order XML (TransOrder)
@@ -199,6 +597,7 @@ def build_purchase_order_xml(
     tz_offset: str = "+08:00",
     # Optional planning origin
     plan_from_location_xid: str = "CNNGB",
+    use_fast_builder: bool = True,                # False => ElementTree/lxml DOM path (A/B validation)
 ) -> bytes:
     """
     Builds a <otm:TransOrder> (Purchase Order) payload.
@@ -219,66 +618,116 @@ def build_purchase_order_xml(
     if lines is None:
         lines = []
 
-    otm_ns = "http://xmlns.oracle.com/apps/otm/transmission/v6.4"
-    gtm_ns = "http://xmlns.oracle.com/apps/gtm/transmission/v6.4"
-    E = lambda tag: f"{{{otm_ns}}}{tag}"
+    if use_fast_builder:
+        esc = _esc_b
+        d = esc(domain)
+        order_refnums = b"".join(
+            PO_ORDER_REFNUM_TMPL % {b"domain": d, b"qual_xid": q, b"value": esc(v)}
+            for q, v in (
+                (b"SUPPLIER_ID", supplier_id),
+                (b"SUPPLIER_NAME", supplier_name),
+                (b"LE_NAME", le_name),
+                (b"BUYER", buyer),
+                (b"SUPPLIER_SITE_NAME", supplier_site_name),
+                (b"REVISION_NUM", revision_num),
+            )
+        )
+        buf = bytearray(PO_HEADER_TMPL % {
+            b"domain": d, b"po_xid": esc(po_xid), b"release_method_xid": esc(release_method_xid),
+            b"ship_from_xid": esc(supplier_ship_from_xid), b"order_refnums": order_refnums,
+            b"ff_attr2": esc(ff_attr2_text), b"ff_attr3": esc(ff_attr3_text), b"ff_attr4": esc(ff_attr4_text),
+            b"ff_number1": esc(str(ff_number1)), b"ff_date1": esc(ff_date1_yyyymmddhhmmss),
+        })
+        if not lines:
+            buf.extend(b"<otm:TransOrderLineDetail/>")
+        else:
+            buf.extend(b"<otm:TransOrderLineDetail>")
+            # per-PO constants, escaped once
+            line_consts = {
+                b"domain": d, b"ship_from_xid": esc(supplier_ship_from_xid), b"ship_to_xid": esc(dc_ship_to_xid),
+                b"rate_to_base": _num_b(rate_to_base), b"func_currency_amount": _num_b(func_currency_amount),
+                b"early": esc(early_pickup_dt), b"late": esc(late_pickup_dt), b"tz_id": esc(tz_id), b"tz_offset": esc(tz_offset),
+                b"plan_from_xid": esc(plan_from_location_xid), b"ff_number1": esc(str(ff_number1)),
+            }
+            for idx, L in enumerate(lines, start=1):
+                line_number = int(L.get("line_number", idx))
+                schedule_number = int(L.get("schedule_number", 1))
+                item_number = str(L.get("item_number", ""))
+                line_refnums = (
+                    PO_LINE_REFNUM_TMPL % {b"domain": d, b"qual_xid": b"LINE_NUMBER", b"value": _num_b(line_number)}
+                    + PO_LINE_REFNUM_TMPL % {b"domain": d, b"qual_xid": b"SCHEDULE_NUMBER", b"value": _num_b(schedule_number)}
+                )
+                if item_number:
+                    line_refnums += PO_LINE_REFNUM_TMPL % {b"domain": d, b"qual_xid": b"ITEM_NUMBER", b"value": esc(item_number)}
+                buf.extend(PO_LINE_TMPL % {
+                    **line_consts,
+                    b"line_xid": esc(f"{po_xid}-{line_number:03d}-{schedule_number:03d}"),
+                    b"item_xid": esc(L["packaged_item_xid"]),
+                    b"qty": int(L["qty"]),
+                    b"currency": esc(str(L.get("currency", currency))),
+                    b"value": _num_b(float(L["declared_value"])),
+                    b"line_refnums": line_refnums,
+                })
+            buf.extend(b"</otm:TransOrderLineDetail>")
+        buf.extend(PO_FOOTER_TMPL)
+        return bytes(buf)
 
-    root = ET.Element(f"{{{otm_ns}}}Transmission", {"xmlns:otm": otm_ns, "xmlns:gtm": gtm_ns})
-    ET.SubElement(root, E("TransmissionHeader"))
+    root = _new_transmission_root()
+    ET.SubElement(root, TAG_TRANSMISSION_HEADER)
 
-    body = ET.SubElement(root, E("TransmissionBody"))
-    glx = ET.SubElement(body, E("GLogXMLElement"))
-    to = ET.SubElement(glx, E("TransOrder"))
+    body = ET.SubElement(root, TAG_TRANSMISSION_BODY)
+    glx = ET.SubElement(body, TAG_GLOG_XML_ELEMENT)
+    to = ET.SubElement(glx, TAG_TRANS_ORDER)
 
     # Header
-    toh = ET.SubElement(to, E("TransOrderHeader"))
+    toh = ET.SubElement(to, TAG_TRANS_ORDER_HEADER)
 
-    tog = ET.SubElement(toh, E("TransOrderGid"))
-    gid = ET.SubElement(tog, E("Gid"))
-    ET.SubElement(gid, E("DomainName")).text = domain
-    ET.SubElement(gid, E("Xid")).text = po_xid
+    tog = ET.SubElement(toh, TAG_TRANS_ORDER_GID)
+    gid = ET.SubElement(tog, TAG_GID)
+    ET.SubElement(gid, TAG_DOMAIN_NAME).text = domain
+    ET.SubElement(gid, TAG_XID).text = po_xid
 
-    ET.SubElement(toh, E("TransactionCode")).text = "IU"
+    ET.SubElement(toh, TAG_TRANSACTION_CODE).text = _IU
 
     # Release method
-    rmg = ET.SubElement(toh, E("ReleaseMethodGid"))
-    gid_rm = ET.SubElement(rmg, E("Gid"))
-    ET.SubElement(gid_rm, E("DomainName")).text = domain
-    ET.SubElement(gid_rm, E("Xid")).text = release_method_xid
+    rmg = ET.SubElement(toh, TAG_RELEASE_METHOD_GID)
+    gid_rm = ET.SubElement(rmg, TAG_GID)
+    ET.SubElement(gid_rm, TAG_DOMAIN_NAME).text = domain
+    ET.SubElement(gid_rm, TAG_XID).text = release_method_xid
 
     # InvolvedParty SHIP FROM
-    ip = ET.SubElement(toh, E("InvolvedParty"))
-    ipq = ET.SubElement(ip, E("InvolvedPartyQualifierGid"))
-    gid_ipq = ET.SubElement(ipq, E("Gid"))
-    ET.SubElement(gid_ipq, E("Xid")).text = "SHIP FROM"
-
-    ip_loc_ref = ET.SubElement(ip, E("InvolvedPartyLocationRef"))
-    loc_ref = ET.SubElement(ip_loc_ref, E("LocationRef"))
-    loc_gid = ET.SubElement(loc_ref, E("LocationGid"))
-    gid_loc = ET.SubElement(loc_gid, E("Gid"))
-    ET.SubElement(gid_loc, E("DomainName")).text = domain
-    ET.SubElement(gid_loc, E("Xid")).text = supplier_ship_from_xid
-
-    contact_ref = ET.SubElement(ip, E("ContactRef"))
-    contact = ET.SubElement(contact_ref, E("Contact"))
-    contact_gid = ET.SubElement(contact, E("ContactGid"))
-    gid_c = ET.SubElement(contact_gid, E("Gid"))
-    ET.SubElement(gid_c, E("DomainName")).text = domain
-    ET.SubElement(gid_c, E("Xid")).text = supplier_ship_from_xid
+    ip = ET.SubElement(toh, TAG_INVOLVED_PARTY)
+    ipq = ET.SubElement(ip, TAG_INVOLVED_PARTY_QUALIFIER_GID)
+    gid_ipq = ET.SubElement(ipq, TAG_GID)
+    ET.SubElement(gid_ipq, TAG_XID).text = "SHIP FROM"
+
+    ip_loc_ref = ET.SubElement(ip, TAG_INVOLVED_PARTY_LOCATION_REF)
+    loc_ref = ET.SubElement(ip_loc_ref, TAG_LOCATION_REF)
+    loc_gid = ET.SubElement(loc_ref, TAG_LOCATION_GID)
+    gid_loc = ET.SubElement(loc_gid, TAG_GID)
+    ET.SubElement(gid_loc, TAG_DOMAIN_NAME).text = domain
+    ET.SubElement(gid_loc, TAG_XID).text = supplier_ship_from_xid
+
+    contact_ref = ET.SubElement(ip, TAG_CONTACT_REF)
+    contact = ET.SubElement(contact_ref, TAG_CONTACT)
+    contact_gid = ET.SubElement(contact, TAG_CONTACT_GID)
+    gid_c = ET.SubElement(contact_gid, TAG_GID)
+    ET.SubElement(gid_c, TAG_DOMAIN_NAME).text = domain
+    ET.SubElement(gid_c, TAG_XID).text = supplier_ship_from_xid
 
     # OrderType = PURCHASE_ORDER
-    otg = ET.SubElement(toh, E("OrderTypeGid"))
-    gid_ot = ET.SubElement(otg, E("Gid"))
-    ET.SubElement(gid_ot, E("Xid")).text = "PURCHASE_ORDER"
+    otg = ET.SubElement(toh, TAG_ORDER_TYPE_GID)
+    gid_ot = ET.SubElement(otg, TAG_GID)
+    ET.SubElement(gid_ot, TAG_XID).text = _PURCHASE_ORDER
 
     # OrderRefnums
     def add_order_refnum(qual_xid: str, value: str):
-        rn = ET.SubElement(toh, E("OrderRefnum"))
-        rq = ET.SubElement(rn, E("OrderRefnumQualifierGid"))
-        gid_rq = ET.SubElement(rq, E("Gid"))
-        ET.SubElement(gid_rq, E("DomainName")).text = domain
-        ET.SubElement(gid_rq, E("Xid")).text = qual_xid
-        ET.SubElement(rn, E("OrderRefnumValue")).text = value
+        rn = ET.SubElement(toh, TAG_ORDER_REFNUM)
+        rq = ET.SubElement(rn, TAG_ORDER_REFNUM_QUALIFIER_GID)
+        gid_rq = ET.SubElement(rq, TAG_GID)
+        ET.SubElement(gid_rq, TAG_DOMAIN_NAME).text = domain
+        ET.SubElement(gid_rq, TAG_XID).text = qual_xid
+        ET.SubElement(rn, TAG_ORDER_REFNUM_VALUE).text = value
 
     add_order_refnum("SUPPLIER_ID", supplier_id)
     add_order_refnum("SUPPLIER_NAME", supplier_name)
@@ -288,22 +737,22 @@ def build_purchase_order_xml(
     add_order_refnum("REVISION_NUM", revision_num)
 
     # Flex fields (Strings/Numbers/Dates)
-    ffs = ET.SubElement(toh, E("FlexFieldStrings"))
-    ET.SubElement(ffs, E("Attribute2")).text = ff_attr2_text
-    ET.SubElement(ffs, E("Attribute3")).text = ff_attr3_text
-    ET.SubElement(ffs, E("Attribute4")).text = ff_attr4_text
+    ffs = ET.SubElement(toh, TAG_FLEX_FIELD_STRINGS)
+    ET.SubElement(ffs, TAG_ATTRIBUTE_2).text = ff_attr2_text
+    ET.SubElement(ffs, TAG_ATTRIBUTE_3).text = ff_attr3_text
+    ET.SubElement(ffs, TAG_ATTRIBUTE_4).text = ff_attr4_text
 
-    ffn = ET.SubElement(toh, E("FlexFieldNumbers"))
-    ET.SubElement(ffn, E("AttributeNumber1")).text = str(ff_number1)
+    ffn = ET.SubElement(toh, TAG_FLEX_FIELD_NUMBERS)
+    ET.SubElement(ffn, TAG_ATTRIBUTE_NUMBER_1).text = str(ff_number1)
 
-    ffd = ET.SubElement(toh, E("FlexFieldDates"))
-    ad1 = ET.SubElement(ffd, E("AttributeDate1"))
-    ET.SubElement(ad1, E("GLogDate")).text = ff_date1_yyyymmddhhmmss
+    ffd = ET.SubElement(toh, TAG_FLEX_FIELD_DATES)
+    ad1 = ET.SubElement(ffd, TAG_ATTRIBUTE_DATE_1)
+    ET.SubElement(ad1, TAG_GLOG_DATE).text = ff_date1_yyyymmddhhmmss
 
-    ET.SubElement(toh, E("FlexFieldCurrencies"))
+    ET.SubElement(toh, TAG_FLEX_FIELD_CURRENCIES)
 
     # Lines
-    told = ET.SubElement(to, E("TransOrderLineDetail"))
+    told = ET.SubElement(to, TAG_TRANS_ORDER_LINE_DETAIL)
 
     for idx, L in enumerate(lines, start=1):
         line_number = int(L.get("line_number", idx))
@@ -314,75 +763,75 @@ def build_purchase_order_xml(
         item_number = str(L.get("item_number", ""))
         line_currency = str(L.get("currency", currency))
 
-        tol = ET.SubElement(told, E("TransOrderLine"))
+        tol = ET.SubElement(told, TAG_TRANS_ORDER_LINE)
 
         # TransOrderLineGid: POXID-<line>-<schedule> (3-digit pads)
-        tolg = ET.SubElement(tol, E("TransOrderLineGid"))
-        gid_l = ET.SubElement(tolg, E("Gid"))
-        ET.SubElement(gid_l, E("DomainName")).text = domain
-        ET.SubElement(gid_l, E("Xid")).text = f"{po_xid}-{line_number:03d}-{schedule_number:03d}"
+        tolg = ET.SubElement(tol, TAG_TRANS_ORDER_LINE_GID)
+        gid_l = ET.SubElement(tolg, TAG_GID)
+        ET.SubElement(gid_l, TAG_DOMAIN_NAME).text = domain
+        ET.SubElement(gid_l, TAG_XID).text = f"{po_xid}-{line_number:03d}-{schedule_number:03d}"
 
-        ET.SubElement(tol, E("TransactionCode")).text = "IU"
+        ET.SubElement(tol, TAG_TRANSACTION_CODE).text = _IU
 
         # Item
-        piref = ET.SubElement(tol, E("PackagedItemRef"))
-        pig = ET.SubElement(piref, E("PackagedItemGid"))
-        gid_pi = ET.SubElement(pig, E("Gid"))
-        ET.SubElement(gid_pi, E("DomainName")).text = domain
-        ET.SubElement(gid_pi, E("Xid")).text = packaged_item_xid
+        piref = ET.SubElement(tol, TAG_PACKAGED_ITEM_REF)
+        pig = ET.SubElement(piref, TAG_PACKAGED_ITEM_GID)
+        gid_pi = ET.SubElement(pig, TAG_GID)
+        ET.SubElement(gid_pi, TAG_DOMAIN_NAME).text = domain
+        ET.SubElement(gid_pi, TAG_XID).text = packaged_item_xid
 
         # ShipFrom / ShipTo (per line)
-        sfrom = ET.SubElement(tol, E("ShipFromLocationRef"))
-        lref_from = ET.SubElement(sfrom, E("LocationRef"))
-        lgid_from = ET.SubElement(lref_from, E("LocationGid"))
-        gid_from = ET.SubElement(lgid_from, E("Gid"))
-        ET.SubElement(gid_from, E("DomainName")).text = domain
-        ET.SubElement(gid_from, E("Xid")).text = supplier_ship_from_xid
-
-        sto = ET.SubElement(tol, E("ShipToLocationRef"))
-        lref_to = ET.SubElement(sto, E("LocationRef"))
-        lgid_to = ET.SubElement(lref_to, E("LocationGid"))
-        gid_to = ET.SubElement(lgid_to, E("Gid"))
-        ET.SubElement(gid_to, E("DomainName")).text = domain
-        ET.SubElement(gid_to, E("Xid")).text = dc_ship_to_xid
+        sfrom = ET.SubElement(tol, TAG_SHIP_FROM_LOCATION_REF)
+        lref_from = ET.SubElement(sfrom, TAG_LOCATION_REF)
+        lgid_from = ET.SubElement(lref_from, TAG_LOCATION_GID)
+        gid_from = ET.SubElement(lgid_from, TAG_GID)
+        ET.SubElement(gid_from, TAG_DOMAIN_NAME).text = domain
+        ET.SubElement(gid_from, TAG_XID).text = supplier_ship_from_xid
+
+        sto = ET.SubElement(tol, TAG_SHIP_TO_LOCATION_REF)
+        lref_to = ET.SubElement(sto, TAG_LOCATION_REF)
+        lgid_to = ET.SubElement(lref_to, TAG_LOCATION_GID)
+        gid_to = ET.SubElement(lgid_to, TAG_GID)
+        ET.SubElement(gid_to, TAG_DOMAIN_NAME).text = domain
+        ET.SubElement(gid_to, TAG_XID).text = dc_ship_to_xid
 
         # Quantity + Declared Value (+ currency details)
-        iq = ET.SubElement(tol, E("ItemQuantity"))
-        ET.SubElement(iq, E("PackagedItemCount")).text = str(qty)
-        dv = ET.SubElement(iq, E("DeclaredValue"))
-        fa = ET.SubElement(dv, E("FinancialAmount"))
-        ET.SubElement(fa, E("GlobalCurrencyCode")).text = line_currency
-        ET.SubElement(fa, E("MonetaryAmount")).text = str(declared_value)
-        ET.SubElement(fa, E("RateToBase")).text = str(rate_to_base)
-        ET.SubElement(fa, E("FuncCurrencyAmount")).text = str(func_currency_amount)
+        iq = ET.SubElement(tol, TAG_ITEM_QUANTITY)
+        ET.SubElement(iq, TAG_PACKAGED_ITEM_COUNT).text = str(qty)
+        dv = ET.SubElement(iq, TAG_DECLARED_VALUE)
+        fa = ET.SubElement(dv, TAG_FINANCIAL_AMOUNT)
+        ET.SubElement(fa, TAG_GLOBAL_CURRENCY_CODE).text = line_currency
+        ET.SubElement(fa, TAG_MONETARY_AMOUNT).text = str(declared_value)
+        ET.SubElement(fa, TAG_RATE_TO_BASE).text = str(rate_to_base)
+        ET.SubElement(fa, TAG_FUNC_CURRENCY_AMOUNT).text = str(func_currency_amount)
 
         # TimeWindow with TZ info
-        tw = ET.SubElement(tol, E("TimeWindow"))
-        ep = ET.SubElement(tw, E("EarlyPickupDt"))
-        ET.SubElement(ep, E("GLogDate")).text = early_pickup_dt
-        ET.SubElement(ep, E("TZId")).text = tz_id
-        ET.SubElement(ep, E("TZOffset")).text = tz_offset
+        tw = ET.SubElement(tol, TAG_TIME_WINDOW)
+        ep = ET.SubElement(tw, TAG_EARLY_PICKUP_DT)
+        ET.SubElement(ep, TAG_GLOG_DATE).text = early_pickup_dt
+        ET.SubElement(ep, TAG_TZ_ID).text = tz_id
+        ET.SubElement(ep, TAG_TZ_OFFSET).text = tz_offset
 
-        lp = ET.SubElement(tw, E("LatePickupDt"))
-        ET.SubElement(lp, E("GLogDate")).text = late_pickup_dt
-        ET.SubElement(lp, E("TZId")).text = tz_id
-        ET.SubElement(lp, E("TZOffset")).text = tz_offset
+        lp = ET.SubElement(tw, TAG_LATE_PICKUP_DT)
+        ET.SubElement(lp, TAG_GLOG_DATE).text = late_pickup_dt
+        ET.SubElement(lp, TAG_TZ_ID).text = tz_id
+        ET.SubElement(lp, TAG_TZ_OFFSET).text = tz_offset
 
         # PlanFromLocationGid
-        pfg = ET.SubElement(tol, E("PlanFromLocationGid"))
-        pfg_loc = ET.SubElement(pfg, E("LocationGid"))
-        gid_pf = ET.SubElement(pfg_loc, E("Gid"))
-        ET.SubElement(gid_pf, E("DomainName")).text = domain
-        ET.SubElement(gid_pf, E("Xid")).text = plan_from_location_xid
+        pfg = ET.SubElement(tol, TAG_PLAN_FROM_LOCATION_GID)
+        pfg_loc = ET.SubElement(pfg, TAG_LOCATION_GID)
+        gid_pf = ET.SubElement(pfg_loc, TAG_GID)
+        ET.SubElement(gid_pf, TAG_DOMAIN_NAME).text = domain
+        ET.SubElement(gid_pf, TAG_XID).text = plan_from_location_xid
 
         # OrderLine refnums
         def add_line_refnum(qual_xid: str, value: str):
-            oln = ET.SubElement(tol, E("OrderLineRefnum"))
-            olq = ET.SubElement(oln, E("OrderLineRefnumQualifierGid"))
-            gid_olq = ET.SubElement(olq, E("Gid"))
-            ET.SubElement(gid_olq, E("DomainName")).text = domain
-            ET.SubElement(gid_olq, E("Xid")).text = qual_xid
-            ET.SubElement(oln, E("OrderLineRefnumValue")).text = value
+            oln = ET.SubElement(tol, TAG_ORDER_LINE_REFNUM)
+            olq = ET.SubElement(oln, TAG_ORDER_LINE_REFNUM_QUALIFIER_GID)
+            gid_olq = ET.SubElement(olq, TAG_GID)
+            ET.SubElement(gid_olq, TAG_DOMAIN_NAME).text = domain
+            ET.SubElement(gid_olq, TAG_XID).text = qual_xid
+            ET.SubElement(oln, TAG_ORDER_LINE_REFNUM_VALUE).text = value
 
         add_line_refnum("LINE_NUMBER", str(line_number))
         add_line_refnum("SCHEDULE_NUMBER", str(schedule_number))
@@ -390,41 +839,115 @@ def build_purchase_order_xml(
             add_line_refnum("ITEM_NUMBER", item_number)
 
         # Line Flex fields (Strings/Numbers)
-        lffs = ET.SubElement(tol, E("FlexFieldStrings"))
-        ET.SubElement(lffs, E("Attribute1")).text = "COUNTRY_OF_ORIGIN"
-        ET.SubElement(lffs, E("Attribute2")).text = "UOMCODE"
+        lffs = ET.SubElement(tol, TAG_FLEX_FIELD_STRINGS)
+        ET.SubElement(lffs, TAG_ATTRIBUTE_1).text = "COUNTRY_OF_ORIGIN"
+        ET.SubElement(lffs, TAG_ATTRIBUTE_2).text = "UOMCODE"
 
-        lffn = ET.SubElement(tol, E("FlexFieldNumbers"))
-        ET.SubElement(lffn, E("AttributeNumber1")).text = str(ff_number1)
-        ET.SubElement(lffn, E("AttributeNumber2")).text = str(ff_number1)
+        lffn = ET.SubElement(tol, TAG_FLEX_FIELD_NUMBERS)
+        ET.SubElement(lffn, TAG_ATTRIBUTE_NUMBER_1).text = str(ff_number1)
+        ET.SubElement(lffn, TAG_ATTRIBUTE_NUMBER_2).text = str(ff_number1)
 
-        ET.SubElement(tol, E("FlexFieldDates"))  # empty block
+        ET.SubElement(tol, TAG_FLEX_FIELD_DATES)  # empty block
 
-    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+    return _tostring_with_decl(root)
 
 # =========================
 # 🌐 POST + ACK helpers
 # =========================
-def post_to_otm(otm_url: str, username: str, password: str, xml_bytes: bytes, gzip_payload: bool=False) -> str:
+# OTM XML compresses ~10-20x; set OTM_GZIP=0 for servers that reject Content-Encoding: gzip.
+OTM_GZIP = os.getenv("OTM_GZIP", "1") != "0"
+OTM_GZIP_LEVEL = 3  # gzip level for POST bodies: cheap to encode, most of the max ratio on XML
+OTM_POST_WORKERS = 16
+OTM_TIMEOUT = (5, 60)  # (connect, read) seconds: fail fast on a dead host, allow slow acks
+NOT_POSTED_RESULT = ("NOT_POSTED", "(dry run)")
+ACK_NOTE_MAX = 200  # chars of ack/error text shown per results row
+
+@st.cache_resource
+def _otm_client() -> httpx.Client:
+    """One keep-alive client shared across reruns; with h2 installed, concurrent POSTs multiplex over one TLS connection per host."""
+    # retries= only covers connect failures, so a payload is never sent twice
+    transport = httpx.HTTPTransport(http2=HAS_HTTP2, retries=2, limits=httpx.Limits(max_keepalive_connections=32))
+    return httpx.Client(
+        transport=transport,
+        timeout=httpx.Timeout(OTM_TIMEOUT[1], connect=OTM_TIMEOUT[0]),
+        follow_redirects=True,
+    )
+
+_client = _otm_client()
+
+def _gzip_body(xml_bytes: bytes) -> bytes:
+    """gzip a POST body at OTM_GZIP_LEVEL: libdeflate when installed, stdlib gzip otherwise."""
+    if HAS_LIBDEFLATE:
+        return bytes(_libdeflate.gzip_compress(xml_bytes, OTM_GZIP_LEVEL))  # bytes: httpx would iterate a bytearray
+    return gzip.compress(xml_bytes, compresslevel=OTM_GZIP_LEVEL)
+
+def post_to_otm(otm_url: str, username: str, password: str, xml_bytes: bytes, gzip_payload: bool=OTM_GZIP) -> str:
+    """POST one payload over the shared client."""
     headers = {"Content-Type": "text/xml; charset=UTF-8"}
-    data = gzip.compress(xml_bytes) if gzip_payload else xml_bytes
+    data = _gzip_body(xml_bytes) if gzip_payload else xml_bytes
     if gzip_payload:
         headers["Content-Encoding"] = "gzip"
-    resp = requests.post(otm_url, auth=(username, password), data=data, headers=headers, timeout=60)
+    resp = _client.post(otm_url, auth=(username, password), content=data, headers=headers)
     resp.raise_for_status()
     return resp.text
 
-def parse_ack_for_status(xml_text: str):
+def post_and_classify(otm_url: str, username: str, password: str, xml_bytes: bytes, gzip_payload: bool=OTM_GZIP):
+    """POST one payload; returns (status, snippet) and never raises."""
+    try:
+        ack = post_to_otm(otm_url, username, password, xml_bytes, gzip_payload=gzip_payload)
+        return parse_ack_for_status(ack)
+    except httpx.HTTPStatusError as e:
+        resp = e.response
+        body = ""
+        try:
+            body = resp.text[:1000] if resp is not None else ""
+        except Exception:
+            pass
+        # status line, not str(e): httpx's message is long enough that ACK_NOTE_MAX would cut the body off
+        return (f"HTTP_ERROR {resp.status_code}", f"{resp.status_code} {resp.reason_phrase} :: {body}")
+    except httpx.HTTPError as e:
+        return ("NETWORK_ERROR", str(e)[:1000])
+    except Exception as e:
+        return ("APP_ERROR", str(e)[:1000])
+
+def post_many_to_otm(otm_url: str, username: str, password: str, payloads: list, gzip_payload: bool=OTM_GZIP, max_workers: int=OTM_POST_WORKERS) -> list:
+    """POST xml payloads concurrently over the shared client; [(status, snippet)] in input order."""
+    if not payloads:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda xml_bytes: post_and_classify(otm_url, username, password, xml_bytes, gzip_payload), payloads))
+
+# One linear scan over the raw ack bytes: group 1 = error marker, group 2 = warning marker,
+# otherwise the <TransmissionAck> root (any namespace prefix).
+STATUS_RE = re.compile(
+    rb"(SEVERITY_ERROR|<(?:\w+:)?SeverityError\b)|(SEVERITY_WARNING|<(?:\w+:)?SeverityWarning\b)|<(?:\w+:)?TransmissionAck\b"
+)
+
+def parse_ack_for_status(xml_text):
+    """Classify an OTM ack (str or bytes) with STATUS_RE; only non-ack bodies are parsed to tell OK from UNKNOWN."""
+    data = xml_text.encode("utf-8") if isinstance(xml_text, str) else xml_text
+    snippet = data[:1000].decode("utf-8", errors="replace")
+    warning = is_ack = False
+    for m in STATUS_RE.finditer(data):
+        if m.group(1):
+            return ("ERROR", snippet)
+        if m.group(2):
+            warning = True
+        else:
+            is_ack = True
+    if warning:
+        return ("WARNING", snippet)
+    if is_ack:
+        return ("OK", snippet)
     try:
-        root = ET.fromstring(xml_text)
-        txt = ET.tostring(root, encoding="unicode")
-        if "SEVERITY_ERROR" in txt or "ERROR" in txt:
-            return ("ERROR", txt[:1000])
-        if "SEVERITY_WARNING" in txt or "WARNING" in txt:
-            return ("WARNING", txt[:1000])
-        return ("OK", txt[:1000])
+        ET.fromstring(data)  # bytes: lxml refuses str input that carries an encoding declaration
     except ET.ParseError:
-        return ("UNKNOWN", xml_text[:1000])
+        return ("UNKNOWN", snippet)
+    return ("OK", snippet)
+
+def _results_table(rows: list):
+    """Results rows as an Arrow table (Streamlit's wire format) when pyarrow is installed."""
+    return pa.Table.from_pylist(rows) if HAS_PYARROW else rows
 
 # =========================
 # 📥 Templates + Import Core (CSV / Excel)
@@ -439,6 +962,18 @@ PO_CSV_TEMPLATE = """po_xid,supplier_ship_from_xid,dc_ship_to_xid,packaged_item_
 PO_09000-1128,300000016179177,110,400000004438186,2800,9702,116783,1,1,USD,20250718102700,20250725102700,Asia/Taipei,+08:00,CNNGB,10010,BPT - PRO POWER CO LTD,THE HILLMAN GROUP,THE HILLMAN GROUP,KAOHSIUNG CITY,0
 """
 
+# Declared CSV/Excel column types. Identifier/text columns are read as strings up front:
+# no inference pass, and IDs keep leading zeros instead of round-tripping through int/float.
+# Numeric columns are left to _type_columns, which coerces blanks/garbage the same way for every source.
+SO_DTYPES = {c: "string" for c in (
+    "order_id", "ship_from_xid", "ship_to_xid", "item_xid", "currency", "release_line_id",
+)}
+PO_DTYPES = {c: "string" for c in (
+    "po_xid", "supplier_ship_from_xid", "dc_ship_to_xid", "packaged_item_xid", "item_number", "currency",
+    "early_pickup_dt", "late_pickup_dt", "tz_id", "tz_offset", "plan_from_location_xid",
+    "supplier_id", "supplier_name", "le_name", "buyer", "supplier_site_name", "revision_num",
+)}
+
 def _download_template_csv(name: str, content: str):
     st.download_button(
         f"⬇️ Download {name} CSV template",
@@ -448,26 +983,122 @@ def _download_template_csv(name: str, content: str):
         use_container_width=True
     )
 
-def _read_tabular(uploaded):
-    """Read CSV/Excel into DataFrame. Requires openpyxl for .xlsx/.xls."""
-    name = (uploaded.name or "").lower()
+def _header_dtypes(header, dtypes: dict) -> dict:
+    """Re-key the lowercase dtypes map onto the file's own header names (Order_ID, PO_XID, ...)."""
+    if not dtypes:
+        return None
+    return {name: dtypes[str(name).lower()] for name in header if str(name).lower() in dtypes}
+
+def _read_excel(data: bytes, dtypes: dict = None) -> pd.DataFrame:
+    """
+    python-calamine (Rust) engine when installed; pandas' default (openpyxl) otherwise.
+    One parse as raw cell values (object), then the dtypes are applied by header name and the
+    remaining columns get their inferred types back.
+    """
     try:
-        if name.endswith(".csv"):
-            return pd.read_csv(uploaded)
-        elif name.endswith(".xlsx") or name.endswith(".xls"):
-            return pd.read_excel(uploaded)  # engine auto; ensure openpyxl in requirements
-        else:
-            try:
-                uploaded.seek(0)
-                return pd.read_csv(uploaded)
-            except Exception:
-                uploaded.seek(0)
-                return pd.read_excel(uploaded)
-    finally:
+        df = pd.read_excel(io.BytesIO(data), engine="calamine", dtype=object)
+    except ImportError:
+        df = pd.read_excel(io.BytesIO(data), dtype=object)
+    typed = _header_dtypes(df.columns, dtypes) or {}
+    rest = df.columns.difference(list(typed), sort=False)
+    df[rest] = df[rest].infer_objects()
+    return df.astype(typed)
+
+def _read_csv(data: bytes, dtypes: dict = None) -> pd.DataFrame:
+    """pyarrow's multithreaded CSV parser when installed; pandas' C parser otherwise."""
+    first_line = data.split(b"\n", 1)[0].decode("utf-8-sig", errors="replace")
+    dtypes = _header_dtypes(next(csv.reader([first_line]), []), dtypes)
+    if HAS_PYARROW:
+        # column_types makes pyarrow parse these as strings (pandas' engine="pyarrow" infers, then casts)
+        convert = pa_csv.ConvertOptions(
+            column_types={c: pa.string() for c in (dtypes or {})},
+            strings_can_be_null=True,
+        )
+        return pa_csv.read_csv(io.BytesIO(data), convert_options=convert).to_pandas()
+    return pd.read_csv(io.BytesIO(data), dtype=dtypes)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _read_tabular_cached(name: str, data: bytes, order_kind: str) -> pd.DataFrame:
+    """
+    Read uploaded CSV/Excel bytes into a DataFrame with the SO/PO column types (CSV via pyarrow,
+    Excel via python-calamine). Cached on (name, content, kind) so reruns skip re-parsing.
+    """
+    dtypes = SO_DTYPES if order_kind == "Sales Orders" else PO_DTYPES
+    name = (name or "").lower()
+    if name.endswith(".csv"):
+        return _read_csv(data, dtypes)
+    elif name.endswith(".xlsx") or name.endswith(".xls"):
+        return _read_excel(data, dtypes)
+    else:
         try:
-            uploaded.seek(0)
+            return _read_csv(data, dtypes)
         except Exception:
-            pass
+            return _read_excel(data, dtypes)
+
+def _type_columns(
+    df: pd.DataFrame, cols: dict, *, keys=(), ints=(), floats=(), strings=(), defaults=None,
+    required=(), order_key=None,
+) -> pd.DataFrame:
+    """
+    One typing pass over the import columns (on a copy) so the per-group loops only slice typed data.
+    keys -> Arrow-backed strings when pyarrow is installed (groupby factorizes them in pyarrow
+    instead of hashing objects), pandas strings otherwise;
+    ints -> int64 (blank/invalid -> 0 unless required); floats -> float64 (blank/invalid -> NaN);
+    strings -> stripped pandas strings. Keys the file doesn't have are skipped.
+    defaults: {key: value} fills blanks, and adds the column when the file doesn't have it
+    (cols is updated in place to point at it).
+    required: columns that must hold a value on every row; a blank or non-numeric cell raises
+    ValueError naming the order (order_key column), the column and the file row.
+    """
+    df = df.copy()
+    defaults = defaults or {}
+    for key, value in defaults.items():
+        if key not in cols:
+            df[key] = value
+            cols[key] = key
+    for key in keys:
+        df[cols[key]] = df[cols[key]].astype(KEY_DTYPE)
+    for key in ints + floats:
+        if key in cols:
+            df[cols[key]] = pd.to_numeric(df[cols[key]], errors="coerce").astype(np.float64)
+    for key in strings:
+        if key in cols:
+            df[cols[key]] = df[cols[key]].astype("string").str.strip()
+    for key, value in defaults.items():
+        df[cols[key]] = df[cols[key]].fillna(value)
+    for key in required:
+        col = df[cols[key]]
+        bad = col.isna() | (col.astype("string").str.strip() == "").fillna(True)
+        if bad.any():
+            pos = int(np.flatnonzero(bad.to_numpy())[0])
+            order = df[cols[order_key]].iloc[pos] if order_key else None
+            order = "<blank>" if pd.isna(order) else str(order).strip()
+            raise ValueError(
+                f"Order {order}: blank or invalid '{cols[key]}' on file row {pos + 2} "
+                f"({int(bad.sum())} row(s) affected)"
+            )
+    for key in ints:
+        if key in cols:
+            df[cols[key]] = df[cols[key]].fillna(0).astype(np.int64)
+    return df
+
+def _so_line_xids(df: pd.DataFrame, cols: dict, group_keys: list) -> list:
+    """
+    ReleaseLineGid XIDs for every SO row, computed once over the whole table:
+    release_line_id if present, else {order_id}_{line_number:03d}, else {order_id}_{row# within its order:03d}.
+    """
+    nums = df.groupby(group_keys, dropna=False, sort=False).cumcount() + 1  # fallback to row order (1-based)
+    if "line_number" in cols:
+        given = pd.to_numeric(df[cols["line_number"]], errors="coerce")
+        nums = given.where(np.isfinite(given), nums)
+    auto = [
+        f"{order_id}_{num:03d}"
+        for order_id, num in zip(df[cols["order_id"]].str.strip().tolist(), nums.astype(np.int64).tolist())
+    ]
+    if "release_line_id" not in cols:
+        return auto
+    explicit = df[cols["release_line_id"]].astype("string").str.strip().fillna("").tolist()
+    return [e or a for e, a in zip(explicit, auto)]
 
 def build_payloads_from_table(
     df: pd.DataFrame,
@@ -501,41 +1132,30 @@ def build_payloads_from_table(
         if missing:
             raise ValueError(f"Missing required SO columns: {', '.join(sorted(missing))}")
 
-        grouped = df.groupby([cols["order_id"], cols["ship_from_xid"], cols["ship_to_xid"]], dropna=False, sort=False)
+        df = _type_columns(
+            df, cols,
+            keys=("order_id", "ship_from_xid", "ship_to_xid"),
+            ints=("qty",), floats=("value",), strings=("item_xid", "currency"),
+            defaults={"currency": default_currency},
+            required=sorted(required),
+            order_key="order_id",
+        )
+        group_keys = [cols["order_id"], cols["ship_from_xid"], cols["ship_to_xid"]]
+        # line_xid from release_line_id or line_number, else row order within the order (file order preserved)
+        df["_line_xid"] = _so_line_xids(df, cols, group_keys)
+        grouped = df.groupby(group_keys, dropna=False, sort=False)
 
         for (order_id, ship_from_xid, ship_to_xid), g in grouped:
-            # preserve file order; compute line_xid using release_line_id or line_number; else auto by row order
-            lines = []
-            for row_idx, row in g.reset_index(drop=True).iterrows():
-                line_currency = str(row[cols["currency"]]).strip() if "currency" in cols and pd.notna(row[cols["currency"]]) else default_currency
-
-                explicit_line_id = ""
-                if "release_line_id" in cols and pd.notna(row[cols["release_line_id"]]):
-                    explicit_line_id = str(row[cols["release_line_id"]]).strip()
-
-                line_num = None
-                if "line_number" in cols and pd.notna(row[cols["line_number"]]):
-                    try:
-                        line_num = int(row[cols["line_number"]])
-                    except Exception:
-                        line_num = None
-
-                # choose line_xid
-                if explicit_line_id:
-                    line_xid = explicit_line_id
-                elif line_num is not None:
-                    line_xid = f"{str(order_id).strip()}_{line_num:03d}"
-                else:
-                    # fallback to row order (1-based)
-                    line_xid = f"{str(order_id).strip()}_{(row_idx+1):03d}"
-
-                lines.append({
-                    "item_xid": str(row[cols["item_xid"]]).strip(),
-                    "qty": int(row[cols["qty"]]),
-                    "value": float(row[cols["value"]]),
-                    "currency": line_currency,
-                    "line_xid": line_xid,
-                })
+            lines = [
+                {"item_xid": item, "qty": qty, "value": value, "currency": line_currency, "line_xid": line_xid}
+                for item, qty, value, line_currency, line_xid in zip(
+                    g[cols["item_xid"]].tolist(),
+                    g[cols["qty"]].tolist(),
+                    g[cols["value"]].tolist(),
+                    g[cols["currency"]].tolist(),
+                    g["_line_xid"].tolist(),
+                )
+            ]
 
             xml_bytes = build_release_xml(
                 domain=domain,
@@ -557,23 +1177,49 @@ def build_payloads_from_table(
         if missing:
             raise ValueError(f"Missing required PO columns: {', '.join(sorted(missing))}")
 
+        df = _type_columns(
+            df, cols,
+            keys=("po_xid", "supplier_ship_from_xid", "dc_ship_to_xid"),
+            ints=("qty",), floats=("declared_value", "line_number", "schedule_number"),
+            strings=("packaged_item_xid", "item_number", "currency"),
+            defaults={"item_number": "", "schedule_number": 1, "currency": default_currency},
+            required=sorted(required),
+            order_key="po_xid",
+        )
         grouped = df.groupby([cols["po_xid"], cols["supplier_ship_from_xid"], cols["dc_ship_to_xid"]], dropna=False, sort=False)
 
         for (po_xid, supplier_ship_from_xid, dc_ship_to_xid), g in grouped:
-            po_lines = []
-            for _, row in g.iterrows():
-                po_lines.append({
-                    "packaged_item_xid": str(row[cols["packaged_item_xid"]]).strip(),
-                    "qty": int(row[cols["qty"]]),
-                    "declared_value": float(row[cols["declared_value"]]),
-                    "item_number": str(row[cols["item_number"]]).strip() if "item_number" in cols and pd.notna(row[cols["item_number"]]) else "",
-                    "line_number": int(row[cols["line_number"]]) if "line_number" in cols and pd.notna(row[cols["line_number"]]) else len(po_lines) + 1,
-                    "schedule_number": int(row[cols["schedule_number"]]) if "schedule_number" in cols and pd.notna(row[cols["schedule_number"]]) else 1,
-                    "currency": str(row[cols["currency"]]).strip() if "currency" in cols and pd.notna(row[cols["currency"]]) else default_currency,
-                })
-
-            # Optional header overrides if present
-            hdr = lambda key, default: str(g.iloc[0][cols[key]]).strip() if key in cols and pd.notna(g.iloc[0][cols[key]]) else default
+            # blank/absent line_number falls back to row order within the PO
+            line_numbers = np.arange(1, len(g) + 1)
+            if "line_number" in cols:
+                given = g[cols["line_number"]].to_numpy()
+                line_numbers = np.where(np.isnan(given), line_numbers, given).astype(np.int64)
+            schedule_numbers = g[cols["schedule_number"]].to_numpy(dtype=np.float64).astype(np.int64)
+
+            po_lines = [
+                {
+                    "packaged_item_xid": item,
+                    "qty": qty,
+                    "declared_value": value,
+                    "item_number": item_number,
+                    "line_number": line_number,
+                    "schedule_number": schedule_number,
+                    "currency": line_currency,
+                }
+                for item, qty, value, item_number, line_number, schedule_number, line_currency in zip(
+                    g[cols["packaged_item_xid"]].tolist(),
+                    g[cols["qty"]].tolist(),
+                    g[cols["declared_value"]].tolist(),
+                    g[cols["item_number"]].tolist(),
+                    line_numbers.tolist(),
+                    schedule_numbers.tolist(),
+                    g[cols["currency"]].tolist(),
+                )
+            ]
+
+            # Optional header overrides if present (taken from the PO's first row, materialized once)
+            first = g.iloc[0]
+            hdr = lambda key, default: str(first[cols[key]]).strip() if key in cols and pd.notna(first[cols[key]]) else default
             early_pickup_dt = hdr("early_pickup_dt", "20250718102700")
             late_pickup_dt  = hdr("late_pickup_dt",  "20250725102700")
             tz_id           = hdr("tz_id",           "Asia/Taipei")
@@ -665,7 +1311,9 @@ with st.sidebar:
         st.session_state["otm_user"] = otm_user
         st.session_state["otm_pass"] = otm_pass
 
-    if otm_url and not is_nonprod_url(otm_url):
+    # checked once per rerun; the POST paths below reuse it
+    _nonprod = bool(otm_url) and is_nonprod_url(otm_url)
+    if otm_url and not _nonprod:
         st.error("POSTs are disabled: OTM Endpoint must contain 'dev' or 'test'.")
     elif otm_url:
         st.success("Non-prod endpoint detected.")
@@ -677,6 +1325,9 @@ with st.sidebar:
             st.success("Session credentials cleared.")
     with col_b:
         dry_run = st.checkbox("Dry run (don’t POST)", value=True)
+    use_gzip = st.checkbox("Send gzipped XML (Content-Encoding: gzip)", value=OTM_GZIP)
+    compress_zip = st.checkbox("Compress ZIP (slower)", value=False, help="Small bundles are stored uncompressed unless this is on.")
+    zip_level = st.slider("ZIP level (1=fast, 9=small)", min_value=1, max_value=9, value=ZIP_LEVEL)
 
 # ===== Import Mode (CSV/XLSX) =====
 if input_mode == "Import (CSV/Excel)":
@@ -709,8 +1360,9 @@ if input_mode == "Import (CSV/Excel)":
         if not uploaded:
             st.error("Please upload a CSV or Excel file.")
             st.stop()
+        upload_name, upload_bytes = uploaded.name or "", uploaded.getvalue()
         try:
-            df = _read_tabular(uploaded)
+            df = _read_tabular_cached(upload_name, upload_bytes, order_kind)  # cached on the uploaded bytes
         except Exception as e:
             st.error(f"Failed to read file: {e}")
             st.stop()
@@ -729,49 +1381,36 @@ if input_mode == "Import (CSV/Excel)":
             st.stop()
 
         rows = []
-        zip_buf = io.BytesIO()
-        with zipfile.ZipFile(zip_buf, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for human_id, ship_from, ship_to, lines_used, xml_bytes in payloads:
-                status, snippet = ("NOT_POSTED", "(dry run)")
-                if post_btn and not dry_run:
-                    if not (otm_url and otm_user and otm_pass):
-                        status, snippet = ("NO_CREDS", "Provide OTM Endpoint/User/Pass or enable Dry run.")
-                    elif not is_nonprod_url(otm_url):
-                        status, snippet = ("BLOCKED", "Endpoint must contain 'dev' or 'test'.")
-                    else:
-                        try:
-                            ack = post_to_otm(otm_url, otm_user, otm_pass, xml_bytes, gzip_payload=False)
-                            status, snippet = parse_ack_for_status(ack)
-                        except requests.HTTPError as e:
-                            resp = e.response
-                            body = ""
-                            try:
-                                body = resp.text[:1000] if resp is not None else ""
-                            except Exception:
-                                pass
-                            status = f"HTTP_ERROR {getattr(resp, 'status_code', '')}"
-                            snippet = f"{e} :: {body}"
-                        except requests.RequestException as e:
-                            status = "NETWORK_ERROR"
-                            snippet = str(e)[:1000]
-                        except Exception as e:
-                            status = "APP_ERROR"
-                            snippet = str(e)[:1000]
-
-                rows.append({
-                    "Order Kind": "SO" if order_kind == "Sales Orders" else "PO",
-                    "Order ID": human_id,
-                    "Ship From": ship_from,
-                    "Ship To": ship_to,
-                    "# Lines": len(lines_used),
-                    "Status": status,
-                    "Ack / Note": snippet
-                })
-                zf.writestr(f"{human_id}.xml", xml_bytes)
+        # Creds/endpoint don't change within a run: decide once whether to POST or stamp every row
+        if not (post_btn and not dry_run):
+            results = itertools.repeat(NOT_POSTED_RESULT)
+        elif not (otm_url and otm_user and otm_pass):
+            results = itertools.repeat(("NO_CREDS", "Provide OTM Endpoint/User/Pass or enable Dry run."))
+        elif not _nonprod:
+            results = itertools.repeat(("BLOCKED", "Endpoint must contain 'dev' or 'test'."))
+        else:
+            results = post_many_to_otm(otm_url, otm_user, otm_pass, [p[4] for p in payloads], gzip_payload=use_gzip)
 
-        zip_buf.seek(0)
+        sizes = [len(p[4]) for p in payloads]
+        zip_buf = io.BytesIO()
+        zw = ZipStreamWriter(zip_buf, level=zip_level, compress=_zip_should_deflate(sizes, compress_zip),
+                             zip64=len(sizes) >= ZIP_MAX_ENTRIES or sum(sizes) >= ZIP_MAX_SIZE)
+        kind_label = "SO" if order_kind == "Sales Orders" else "PO"
+        for (human_id, ship_from, ship_to, lines_used, xml_bytes), (status, snippet) in zip(payloads, results):
+            rows.append({
+                "Order Kind": kind_label,
+                "Order ID": human_id,
+                "Ship From": ship_from,
+                "Ship To": ship_to,
+                "# Lines": len(lines_used),
+                "Status": status,
+                "Ack / Note": snippet[:ACK_NOTE_MAX]
+            })
+            zw.add(f"{human_id}.xml", xml_bytes)
+
+        zw.close()
         st.success(f"Built {len(payloads)} order(s) from file.")
-        st.dataframe(rows, use_container_width=True)
+        st.dataframe(_results_table(rows), use_container_width=True)
         st.download_button(
             "⬇️ Download all XMLs (ZIP)",
             data=zip_buf,
@@ -826,7 +1465,6 @@ with st.expander("🎚️ Generation Controls", expanded=True):
     min_val = st.number_input("Min declared value", min_value=1, max_value=10_000_000, value=1000, step=1)
     max_val = st.number_input("Max declared value", min_value=min_val, max_value=10_000_000, value=15000, step=1)
     seed = st.number_input("Random seed", min_value=0, max_value=1_000_000, value=42, step=1)
-    use_gzip = st.checkbox("Send gzipped XML (Content-Encoding: gzip)", value=False)
 
 # Buttons
 col_run1, col_run2 = st.columns(2)
@@ -837,7 +1475,7 @@ post_btn = col_run2.button("Generate & POST to OTM")
 if generate_btn or post_btn:
     ship_to_list = _parse_list(ship_to_text)
     item_list = _parse_list(item_text)
-    supplier_list = _parse_list(suppliers_text) if order_kind == "Purchase Orders" else []
+    supplier_list = _parse_list(suppliers_text) if order_kind == "Purchase Orders" else ()
 
     # Validations
     errors = []
@@ -858,7 +1496,7 @@ if generate_btn or post_btn:
     if post_btn and not dry_run:
         if not (otm_url and otm_user and otm_pass):
             errors.append("To POST, provide OTM Endpoint, Username, and Password (or enable Dry run).")
-        if otm_url and not is_nonprod_url(otm_url):
+        if otm_url and not _nonprod:
             errors.append("POST blocked: OTM Endpoint must contain 'dev' or 'test'.")
 
     if int(releases) > 1 and not use_release_suffix_in_gid:
@@ -870,124 +1508,146 @@ if generate_btn or post_btn:
         st.stop()
 
     random.seed(int(seed))
-    payloads = []
-    rows = []
+    # One vectorized draw per field for the whole run instead of 3 random.* calls per line
+    rng = np.random.default_rng(int(seed))
+    num_lines_arr = rng.integers(int(min_lines), int(max_lines) + 1, size=int(releases))
+    total_lines = int(num_lines_arr.sum())
+    items_idx = rng.integers(0, len(item_list), size=total_lines).tolist()
+    qtys = rng.integers(int(min_qty), int(max_qty) + 1, size=total_lines).tolist()
+    vals = rng.integers(int(min_val), int(max_val) + 1, size=total_lines).tolist()
+    pending = []   # (rid, ship_from, ship_to, n_lines, post future or None)
     last_xml = None
-
-    for r in range(1, int(releases) + 1):
-        num_lines = random.randint(int(min_lines), int(max_lines))
-        # Build SO-shaped line dicts first
-        so_lines = []
-        for idx in range(1, num_lines + 1):
-            item = random.choice(item_list)
-            qty = random.randint(int(min_qty), int(max_qty))
-            val = random.randint(int(min_val), int(max_val))
-            # optional suffix in line IDs (if enabled)
+    # Each XML is zipped and (optionally) handed to the POST pool as soon as it is built;
+    # only the row fields + future are kept, so earlier payloads can be freed once posted.
+    zip_buf = io.BytesIO()
+    zw = ZipStreamWriter(zip_buf, level=zip_level, compress=True if compress_zip else None)
+    do_post = post_btn and not dry_run
+
+    def gen_orders():
+        """Build orders one at a time: (rid, ship_from, ship_to, n_lines, xml_bytes)."""
+        line_off = 0
+        for r, num_lines in enumerate(num_lines_arr.tolist(), start=1):
+            # Build SO-shaped line dicts first; line-ID prefix (optional _R# suffix) depends only on r
             prefix = f"{base_release_xid}_R{r}" if use_release_suffix_in_line_ids else base_release_xid
-            line_xid = f"{prefix}_{idx:03d}"
-            so_lines.append({"item_xid": item, "qty": qty, "value": val, "currency": currency, "line_xid": line_xid})
-
-        if order_kind == "Sales Orders":
-            ship_to = random.choice(ship_to_list)
-            xml_bytes = build_release_xml(
-                domain=domain,
-                base_release_xid=base_release_xid,
-                ship_from_xid=ship_from_xid,
-                ship_to_xid=ship_to,
-                lines=so_lines,
-                release_index=r,
-                use_release_suffix_in_gid=use_release_suffix_in_gid,
-                use_release_suffix_in_line_ids=use_release_suffix_in_line_ids,
-                currency=currency,
-            )
-            human_id = f"{base_release_xid}_R{r}" if use_release_suffix_in_gid else base_release_xid
-            ship_from_display = ship_from_xid
-            ship_to_display = ship_to
+            so_lines = []
+            for idx in range(1, num_lines + 1):
+                k = line_off + idx - 1
+                item = item_list[items_idx[k]]
+                qty = qtys[k]
+                val = vals[k]
+                line_xid = f"{prefix}_{idx:03d}"
+                so_lines.append({"item_xid": item, "qty": qty, "value": val, "currency": currency, "line_xid": line_xid})
+
+            if order_kind == "Sales Orders":
+                ship_to = random.choice(ship_to_list)
+                xml_bytes = build_release_xml(
+                    domain=domain,
+                    base_release_xid=base_release_xid,
+                    ship_from_xid=ship_from_xid,
+                    ship_to_xid=ship_to,
+                    lines=so_lines,
+                    release_index=r,
+                    use_release_suffix_in_gid=use_release_suffix_in_gid,
+                    use_release_suffix_in_line_ids=use_release_suffix_in_line_ids,
+                    currency=currency,
+                )
+                human_id = f"{base_release_xid}_R{r}" if use_release_suffix_in_gid else base_release_xid
+                ship_from_display = ship_from_xid
+                ship_to_display = ship_to
+            else:
+                # PO multi-supplier: choose supplier per order
+                supplier_from = random.choice(supplier_list)
+                dc_ship_to = ship_to_list[0]  # first DC listed
+
+                # Convert to PO line shape
+                po_lines = []
+                for idx, line in enumerate(so_lines, start=1):
+                    po_lines.append({
+                        "packaged_item_xid": line["item_xid"],
+                        "qty": line["qty"],
+                        "declared_value": line["value"],
+                        "item_number": line["item_xid"],  # map as needed
+                        "line_number": idx,
+                        "schedule_number": 1,
+                        "currency": line.get("currency", currency),
+                    })
+
+                po_xid = f"{base_release_xid}_R{r}" if use_release_suffix_in_gid else base_release_xid
+                xml_bytes = build_purchase_order_xml(
+                    domain=domain,
+                    po_xid=po_xid,
+                    release_method_xid=f"AUTO_CALC - {domain}",
+                    supplier_ship_from_xid=supplier_from,   # supplier (random)
+                    dc_ship_to_xid=dc_ship_to,             # your DC
+                    lines=po_lines,
+                    currency=currency,
+                    rate_to_base=1.0,
+                    func_currency_amount=0.0,
+                    early_pickup_dt="20250718102700",
+                    late_pickup_dt="20250725102700",
+                    tz_id="Asia/Taipei",
+                    tz_offset="+08:00",
+                    plan_from_location_xid="CNNGB",
+                )
+                human_id = po_xid
+                ship_from_display = supplier_from
+                ship_to_display = dc_ship_to
+            yield human_id, ship_from_display, ship_to_display, len(so_lines), xml_bytes
+            line_off += len(so_lines)
+
+    n_orders = int(releases)
+    progress = st.progress(0.0, text=f"Building 0/{n_orders} orders…")
+    # Orders are built on a worker thread, at most ORDER_QUEUE_MAX ahead of the zip/POST consumer,
+    # and at most OTM_POST_WORKERS + ORDER_QUEUE_MAX payloads sit in the POST pool (running or queued).
+    # If a build, zip write or rerun raises, closing `orders` stops the producer and queued POSTs
+    # are cancelled, so nothing more is sent to OTM for a run the user sees as failed.
+    orders = _prefetch(gen_orders(), ORDER_QUEUE_MAX)
+    in_flight = threading.BoundedSemaphore(OTM_POST_WORKERS + ORDER_QUEUE_MAX)
+    with (ThreadPoolExecutor(max_workers=OTM_POST_WORKERS) if do_post else contextlib.nullcontext()) as pool:
+        try:
+            for done, (human_id, ship_from_display, ship_to_display, n_lines, xml_bytes) in enumerate(orders, start=1):
+                zw.add(f"{human_id}.xml", xml_bytes)
+                future = None
+                if pool:
+                    in_flight.acquire()
+                    future = pool.submit(post_and_classify, otm_url, otm_user, otm_pass, xml_bytes, use_gzip)
+                    future.add_done_callback(lambda _f: in_flight.release())
+                pending.append((human_id, ship_from_display, ship_to_display, n_lines, future))
+                last_xml = xml_bytes
+                progress.progress(done / n_orders, text=f"Building {done}/{n_orders} orders…")
+        except BaseException:
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            orders.close()
+        zw.close()
+        progress.empty()
+
+        # Resolve POSTs (they ran while later orders were being built); rows stay in build order.
+        # Dry runs skip the futures entirely and stamp every row NOT_POSTED.
+        if do_post:
+            results = [future.result() for *_, future in pending]
         else:
-            # PO multi-supplier: choose supplier per order
-            supplier_from = random.choice(supplier_list)
-            dc_ship_to = ship_to_list[0]  # first DC listed
-
-            # Convert to PO line shape
-            po_lines = []
-            for idx, line in enumerate(so_lines, start=1):
-                po_lines.append({
-                    "packaged_item_xid": line["item_xid"],
-                    "qty": line["qty"],
-                    "declared_value": line["value"],
-                    "item_number": line["item_xid"],  # map as needed
-                    "line_number": idx,
-                    "schedule_number": 1,
-                    "currency": line.get("currency", currency),
-                })
-
-            po_xid = f"{base_release_xid}_R{r}" if use_release_suffix_in_gid else base_release_xid
-            xml_bytes = build_purchase_order_xml(
-                domain=domain,
-                po_xid=po_xid,
-                release_method_xid=f"AUTO_CALC - {domain}",
-                supplier_ship_from_xid=supplier_from,   # supplier (random)
-                dc_ship_to_xid=dc_ship_to,             # your DC
-                lines=po_lines,
-                currency=currency,
-                rate_to_base=1.0,
-                func_currency_amount=0.0,
-                early_pickup_dt="20250718102700",
-                late_pickup_dt="20250725102700",
-                tz_id="Asia/Taipei",
-                tz_offset="+08:00",
-                plan_from_location_xid="CNNGB",
-            )
-            human_id = po_xid
-            ship_from_display = supplier_from
-            ship_to_display = dc_ship_to
-
-        payloads.append((human_id, ship_from_display, ship_to_display, so_lines, xml_bytes))
-        last_xml = xml_bytes
-
-    # Optional POST
-    for rid, ship_from, ship_to, lines, xml_bytes in payloads:
-        status, snippet = ("NOT_POSTED", "(dry run)")
-        if post_btn and not dry_run:
-            try:
-                ack = post_to_otm(otm_url, otm_user, otm_pass, xml_bytes, gzip_payload=use_gzip)
-                status, snippet = parse_ack_for_status(ack)
-            except requests.HTTPError as e:
-                resp = e.response
-                body = ""
-                try:
-                    body = resp.text[:1000] if resp is not None else ""
-                except Exception:
-                    pass
-                status = f"HTTP_ERROR {getattr(resp, 'status_code', '')}"
-                snippet = f"{e} :: {body}"
-            except requests.RequestException as e:
-                status = "NETWORK_ERROR"
-                snippet = str(e)[:1000]
-            except Exception as e:
-                status = "APP_ERROR"
-                snippet = str(e)[:1000]
-
-        rows.append({
-            "Order Kind": "SO" if order_kind == "Sales Orders" else "PO",
+            results = itertools.repeat(NOT_POSTED_RESULT)
+    kind_label = "SO" if order_kind == "Sales Orders" else "PO"
+    posted = "Yes" if do_post else "No"
+    rows = [
+        {
+            "Order Kind": kind_label,
             "Order ID": rid,
             "Ship From": ship_from,
             "Ship To": ship_to,
-            "# Lines": len(lines),
-            "Posted?": "Yes" if (post_btn and not dry_run) else "No",
+            "# Lines": n_lines,
+            "Posted?": posted,
             "Status": status,
-            "Ack / Note": snippet
-        })
-
-    # ZIP download of all XMLs
-    zip_buf = io.BytesIO()
-    with zipfile.ZipFile(zip_buf, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for rid, _, _, _, xml_bytes in payloads:
-            zf.writestr(f"{rid}.xml", xml_bytes)
-    zip_buf.seek(0)
+            "Ack / Note": snippet[:ACK_NOTE_MAX]
+        }
+        for (rid, ship_from, ship_to, n_lines, _), (status, snippet) in zip(pending, results)
+    ]
 
-    st.success(f"Generated {len(payloads)} order(s).")
-    st.dataframe(rows, use_container_width=True)
+    st.success(f"Generated {len(pending)} order(s).")
+    st.dataframe(_results_table(rows), use_container_width=True)
     st.download_button(
         "⬇️ Download all XMLs (ZIP)",
         data=zip_buf,